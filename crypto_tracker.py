@@ -11,11 +11,15 @@ Controls:
 
 import customtkinter as ctk
 import asyncio
-import json
+import functools
+import logging
+import math
+import orjson
 import os
-from datetime import datetime
-from typing import Dict, Optional
-from price_fetcher import PriceFetcher
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from price_fetcher import PriceFetcher, close_session, get_session
 import threading
 import tkinter.font as tkfont  # For system fonts
 from tkinter import colorchooser  # For color picker
@@ -67,6 +71,120 @@ CURRENCY_SYMBOLS = {
     'KZT': 'T',
 }
 
+# Settings-triggered refreshes within this window (sec) are merged into one fetch,
+# flushed early once this many are queued
+REFRESH_BATCH_WINDOW = 0.5
+REFRESH_BATCH_THRESHOLD = 3
+
+
+@functools.lru_cache(maxsize=16)
+def _get_font(family: str, size: int, bold: bool) -> ctk.CTkFont:
+    """Get shared font for token labels (one CTkFont per family/size/weight)"""
+    return ctk.CTkFont(family=family, size=size, weight="bold" if bold else "normal")
+
+
+# Shared asyncio loop (one background thread for all tracker windows)
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_USERS = 0
+_LOOP_LOCK = threading.Lock()
+
+# Max wait (sec) on exit for the loop thread to finish teardown (closing sessions/streams)
+LOOP_JOIN_TIMEOUT = 3
+
+
+def _acquire_loop() -> asyncio.AbstractEventLoop:
+    """Get shared event loop, starting its thread on first use"""
+    global _LOOP, _LOOP_THREAD, _LOOP_USERS
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+
+            def run_loop(loop):
+                asyncio.set_event_loop(loop)
+                try:
+                    loop.run_forever()
+                finally:
+                    loop.close()
+
+            _LOOP_THREAD = threading.Thread(target=run_loop, args=(_LOOP,), daemon=True)
+            _LOOP_THREAD.start()
+        _LOOP_USERS += 1
+        return _LOOP
+
+
+def _release_loop() -> Optional[threading.Thread]:
+    """
+    Drop one user of the shared loop
+
+    Returns:
+        Loop thread if this was the last user (caller should stop the loop and join the thread,
+        which closes the loop on exit), otherwise None
+    """
+    global _LOOP, _LOOP_THREAD, _LOOP_USERS
+    with _LOOP_LOCK:
+        _LOOP_USERS -= 1
+        if _LOOP_USERS > 0:
+            return None
+        thread, _LOOP, _LOOP_THREAD = _LOOP_THREAD, None, None
+        return thread
+
+
+def _write_config(config: dict):
+    """Write configuration to file (atomic replace to avoid torn writes)"""
+    try:
+        tmp_path = 'config.json.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, 'config.json')
+    except Exception as e:
+        print(f"❌ Save error: {e}")
+
+
+@functools.lru_cache(maxsize=1)
+def _system_fonts() -> list:
+    """Get sorted system font families (cached - enumeration is a slow Tcl call)"""
+    try:
+        # Filter: remove @-fonts and sort
+        fonts = sorted(f for f in tkfont.families() if not f.startswith('@'))
+        if fonts:
+            return fonts
+    except Exception:
+        pass
+    # Fallback to popular
+    return ["Arial", "Segoe UI", "Tahoma", "Verdana", "Consolas"]
+
+
+# Format spec by price magnitude floor(log10(price)), clamped to [-3, 3]:
+# >= 1000 -> grouped, no decimals; >= 1 -> 2; >= 0.01 -> 4; smaller -> 6
+_FORMAT_BY_MAGNITUDE = ('.6f', '.4f', '.4f', '.2f', '.2f', '.2f', ',.0f')
+
+
+def _price_format(price: float) -> str:
+    """Format spec for price (single log10 instead of a comparison cascade)"""
+    magnitude = math.floor(math.log10(max(price, 1e-12)))
+    return _FORMAT_BY_MAGNITUDE[max(-3, min(3, magnitude)) + 3]
+
+
+def _make_formatter(currency: str) -> Callable[[float], str]:
+    """Build price formatter specialized for currency (called once per currency change)"""
+    # Currency symbol: $ prefix for USD, code suffix for others
+    prefix, suffix = ('$', '') if currency == 'USD' else ('', f" {currency}")
+
+    def format_price(price: float) -> str:
+        return f"{prefix}{price:{_price_format(price)}}{suffix}"
+
+    return format_price
+
+
+class _Row:
+    """Labels of one token row"""
+    __slots__ = ('ticker', 'price')
+
+    def __init__(self, ticker: ctk.CTkLabel, price: ctk.CTkLabel):
+        self.ticker = ticker
+        self.price = price
+
 
 # ================================================================================================
 # 🚀 MAIN WINDOW
@@ -82,8 +200,14 @@ class CryptoTrackerApp(ctk.CTk):
         print("💎 CRYPTO PRICE TRACKER v1.0")
         print("=" * 50)
 
+        # Pending debounced config save (after() id)
+        self._save_pending = None
+        # Single worker keeps config writes ordered
+        self._io_executor = ThreadPoolExecutor(max_workers=1)
+
         # Load configuration
         self.load_config()
+        self._format_price = _make_formatter(self.config.get('currency', 'USD'))
 
         # Window setup
         self.title("")
@@ -98,14 +222,28 @@ class CryptoTrackerApp(ctk.CTk):
         # Flags
         self.is_updating = False
         self.price_data: Dict[str, float] = {}
-        self.token_labels: Dict[str, Dict] = {}
+        self.token_labels: Dict[str, _Row] = {}
+        self._last_text: Dict[str, str] = {}  # Last drawn price text per token
+
+        # Stale-while-revalidate cache: (token, currency) -> (price, monotonic timestamp)
+        self._price_cache: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+        # Long-lived fetcher (reuses HTTP connections across updates)
+        self._fetcher: Optional[PriceFetcher] = None
+
+        # Batched settings-triggered refresh (event loop thread)
+        self._refresh_handle: Optional[asyncio.TimerHandle] = None
+        self._refresh_requests = 0
 
         # Drag & drop
         self._drag_start_x = 0
         self._drag_start_y = 0
+        self._drag_pos = (0, 0)
+        self._drag_job = None
 
         # Create UI
         self.create_widgets()
+        self._current_font_key = (self.config.get('font_family', 'Arial'), self.config.get('font_size', 12))
 
         # Set window size
         self.update_window_size()
@@ -117,12 +255,13 @@ class CryptoTrackerApp(ctk.CTk):
 
         # Event bindings
         self.bind("<Button-1>", self.start_drag)
-        self.bind("<B1-Motion>", self.on_drag)
+        self.bind("<ButtonRelease-1>", self._end_drag)
         self.bind("<Button-2>", lambda e: self.open_settings())  # macOS
         self.bind("<Button-3>", lambda e: self.open_settings())  # Windows/Linux
         self.bind("<Control-Button-1>", lambda e: self.open_settings())  # macOS alternative
         self.bind("<Double-Button-1>", lambda e: self.on_closing())
         self.bind("<Escape>", lambda e: self.on_closing())
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)  # Title bar close also flushes config
 
         # Start update loop
         self.start_update_loop()
@@ -150,8 +289,8 @@ class CryptoTrackerApp(ctk.CTk):
 
         if os.path.exists('config.json'):
             try:
-                with open('config.json', 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
+                with open('config.json', 'rb') as f:
+                    loaded = orjson.loads(f.read())
                     default.update(loaded)
                 print("✅ Configuration loaded")
             except Exception as e:
@@ -163,12 +302,15 @@ class CryptoTrackerApp(ctk.CTk):
         self.save_config()
 
     def save_config(self):
-        """Save configuration to file"""
-        try:
-            with open('config.json', 'w', encoding='utf-8') as f:
-                json.dump(self.config, indent=4, fp=f)
-        except Exception as e:
-            print(f"❌ Save error: {e}")
+        """Schedule configuration save (debounced, only the last change in a burst is written)"""
+        if self._save_pending:
+            self.after_cancel(self._save_pending)
+        self._save_pending = self.after(250, self._flush_config)
+
+    def _flush_config(self):
+        """Hand config snapshot to background writer (keeps disk I/O off the UI thread)"""
+        self._save_pending = None
+        self._io_executor.submit(_write_config, dict(self.config))
 
     def update_window_size(self):
         """Update window size for tokens"""
@@ -195,25 +337,26 @@ class CryptoTrackerApp(ctk.CTk):
 
         ticker = ctk.CTkLabel(
             row, text=token.upper(),
-            font=ctk.CTkFont(family=font_family, size=font_size, weight="bold"),
+            font=_get_font(font_family, font_size, True),
             text_color=text_color, width=45, anchor="w"
         )
         ticker.pack(side="left")
 
         price = ctk.CTkLabel(
             row, text="...",
-            font=ctk.CTkFont(family=font_family, size=font_size),
+            font=_get_font(font_family, font_size, False),
             text_color=text_color, anchor="e"
         )
         price.pack(side="right", fill="x", expand=True)
 
-        self.token_labels[token.upper()] = {'ticker': ticker, 'price': price}
+        self.token_labels[token.upper()] = _Row(ticker, price)
 
     def rebuild_ui(self):
         """Rebuild UI after settings change"""
         for widget in self.table_frame.winfo_children():
             widget.destroy()
         self.token_labels.clear()
+        self._last_text.clear()
 
         font_size = self.config.get('font_size', 12)
         font_family = self.config.get('font_family', 'Arial')
@@ -224,95 +367,207 @@ class CryptoTrackerApp(ctk.CTk):
 
         self.update_window_size()
 
-        bg_color = self.config.get('bg_color', COLORS['bg_dark'])
-        self.configure(fg_color=bg_color)
+        self._paint_from_cache()
+
+    def apply_bg_color(self, color: str):
+        """Change background color in place (no widget rebuild)"""
+        self.configure(fg_color=color)
+        self.config['bg_color'] = color
+        self.save_config()
+
+    def _cached_price(self, token: str, currency: str) -> Tuple[Optional[float], str]:
+        """
+        Look up cached price
+
+        Returns:
+            (price, state) where state is 'hit' (fresh), 'stale' (usable, needs revalidation)
+            or 'miss' (absent or too old to show)
+        """
+        entry = self._price_cache.get((token, currency))
+        if entry is None:
+            return None, 'miss'
+
+        price, ts = entry
+        fresh_ttl = self.config.get('update_interval', 60)
+        age = time.monotonic() - ts
+        if age < fresh_ttl:
+            return price, 'hit'
+        if age < fresh_ttl * 5:
+            return price, 'stale'
+        return None, 'miss'
+
+    def _paint_from_cache(self):
+        """Show last known prices immediately (while network refresh is in flight)"""
+        currency = self.config.get('currency', 'USD')
+        updates = []
+        for token in self.token_labels:
+            price, state = self._cached_price(token, currency)
+            # Prices too old to show (or in another currency) go back to the placeholder
+            text = "..." if state == 'miss' else self._format_price(price)
+            updates.append((token, text))
+        self._apply_price_updates(updates)
+
+    def apply_text_color(self, color: str):
+        """Change text color of all labels in place"""
+        for token_data in self.token_labels.values():
+            token_data.ticker.configure(text_color=color)
+            token_data.price.configure(text_color=color)
+        self.config['text_color'] = color
+        self.save_config()
 
     def start_drag(self, event):
-        self._drag_start_x = event.x
-        self._drag_start_y = event.y
+        # Pointer offset inside the window; motion is tracked only while the button is held
+        self._drag_start_x = event.x_root - self.winfo_x()
+        self._drag_start_y = event.y_root - self.winfo_y()
+        self.bind("<B1-Motion>", self.on_drag)
 
     def on_drag(self, event):
-        x = self.winfo_x() + (event.x - self._drag_start_x)
-        y = self.winfo_y() + (event.y - self._drag_start_y)
+        self._drag_pos = (event.x_root - self._drag_start_x, event.y_root - self._drag_start_y)
+        # At most one geometry call per frame (~16 ms)
+        if self._drag_job is None:
+            self._drag_job = self.after(16, self._apply_drag)
+
+    def _apply_drag(self):
+        self._drag_job = None
+        x, y = self._drag_pos
         self.geometry(f"+{x}+{y}")
 
+    def _end_drag(self, event):
+        self.unbind("<B1-Motion>")
+        if self._drag_job is not None:
+            self.after_cancel(self._drag_job)
+            self._apply_drag()
+
     def open_settings(self):
         """Open settings window"""
         SettingsWindow(self)
 
     def start_update_loop(self):
         """Start price update loop"""
-        self.loop = asyncio.new_event_loop()
-
-        def run_loop():
-            asyncio.set_event_loop(self.loop)
-            self.loop.run_forever()
-
-        self.loop_thread = threading.Thread(target=run_loop, daemon=True)
-        self.loop_thread.start()
-
-        asyncio.run_coroutine_threadsafe(self.update_loop(), self.loop)
+        self.loop = _acquire_loop()
+        self._update_future = asyncio.run_coroutine_threadsafe(self.update_loop(), self.loop)
 
     async def update_loop(self):
         """Main update loop"""
         while True:
             try:
+                self.after(0, self._paint_from_cache)
                 await self.update_prices()
                 await asyncio.sleep(self.config['update_interval'])
             except Exception as e:
                 print(f"❌ Loop error: {e}")
                 await asyncio.sleep(10)
 
+    async def _get_fetcher(self) -> PriceFetcher:
+        """Get shared fetcher, opening its session on first use"""
+        if self._fetcher is None:
+            self._fetcher = await PriceFetcher(session=get_session(), stream_prices=True).__aenter__()
+        return self._fetcher
+
+    async def _shutdown(self, stop_loop: bool):
+        """Release fetcher; close shared session and stop the event loop if no other window uses them"""
+        if self._refresh_handle:
+            self._refresh_handle.cancel()
+        if self._fetcher is not None:
+            await self._fetcher.__aexit__(None, None, None)
+            self._fetcher = None
+        if stop_loop:
+            await close_session()
+            asyncio.get_running_loop().stop()
+
+    def _schedule_refresh(self):
+        """Request price refresh (rapid settings changes are merged into one fetch)"""
+        if getattr(self, 'loop', None) is None:
+            return  # Not started yet / closing: no event loop to refresh on
+        self.loop.call_soon_threadsafe(self._arm_refresh)
+
+    def _arm_refresh(self):
+        """Re-arm batch window timer (event loop thread)"""
+        if self._refresh_handle:
+            self._refresh_handle.cancel()
+        self._refresh_requests += 1
+        if self._refresh_requests >= REFRESH_BATCH_THRESHOLD:
+            self._fire_refresh()
+        else:
+            self._refresh_handle = self.loop.call_later(REFRESH_BATCH_WINDOW, self._fire_refresh)
+
+    def _fire_refresh(self):
+        """Flush batched refresh requests (event loop thread)"""
+        self._refresh_handle = None
+        self._refresh_requests = 0
+        asyncio.ensure_future(self.update_prices())
+
     async def update_prices(self):
         """Update token prices"""
         if self.is_updating:
             return
 
         self.is_updating = True
-        print(f"\n🔄 [{datetime.now().strftime('%H:%M:%S')}] Updating prices...")
+        print(f"\n🔄 [{time.strftime('%H:%M:%S')}] Updating prices...")
 
         try:
-            async with PriceFetcher() as fetcher:
-                await fetcher.update_exchange_rates()
-                prices_usd = await fetcher.get_multiple_prices(self.config['tokens'])
-
-                currency = self.config.get('currency', 'USD')
-
-                for token, price_usd in prices_usd.items():
-                    if token in self.token_labels:
-                        price = fetcher.convert_price(price_usd, currency)
-
-                        # Format price
-                        if price >= 1000:
-                            price_str = f"{price:,.0f}"
-                        elif price >= 1:
-                            price_str = f"{price:.2f}"
-                        elif price >= 0.01:
-                            price_str = f"{price:.4f}"
-                        else:
-                            price_str = f"{price:.6f}"
-                        
-                        # Currency symbol: $ for USD, letters for others
-                        if currency == 'USD':
-                            text = f"${price_str}"
-                        else:
-                            text = f"{price_str} {currency}"
-
-                        self.after(0, lambda t=token, p=text:
-                                  self.token_labels[t]['price'].configure(text=p))
-
-                print(f"✅ Updated {len(prices_usd)} tokens")
+            fetcher = await self._get_fetcher()
+            await fetcher.update_exchange_rates()  # No-op while cached rates are fresh
+
+            prices_usd = await fetcher.get_multiple_prices(self.config['tokens'])
+
+            currency = self.config.get('currency', 'USD')
+            format_price = self._format_price
+
+            now = time.monotonic()
+            updates = []
+            for token, price_usd in prices_usd.items():
+                if price_usd is None:
+                    continue
+                price = fetcher.convert_price(price_usd, currency)
+                self._price_cache[(token, currency)] = (price, now)
+
+                if token in self.token_labels:
+                    updates.append((token, format_price(price)))
+
+            # One Tk callback for all labels instead of one per token
+            self.after(0, self._apply_price_updates, updates)
+
+            print(f"✅ Updated {len(prices_usd)} tokens")
 
         except Exception as e:
             print(f"❌ Update error: {e}")
         finally:
             self.is_updating = False
 
+    def _apply_price_updates(self, updates):
+        """Apply formatted price texts to labels in one pass (Tk thread)"""
+        changed = False
+        for token, text in updates:
+            labels = self.token_labels.get(token)
+            # Skip Tcl round-trip if label already shows this text
+            if labels and self._last_text.get(token) != text:
+                labels.price.configure(text=text)
+                self._last_text[token] = text
+                changed = True
+        if changed:
+            self.update_idletasks()
+
     def on_closing(self):
         """Close application"""
         print("\n👋 Closing application...")
-        if hasattr(self, 'loop') and self.loop:
-            self.loop.call_soon_threadsafe(self.loop.stop)
+        # Close settings windows first: their pending applies may still save config / request refresh
+        for child in list(self.winfo_children()):
+            if isinstance(child, SettingsWindow):
+                child.destroy()
+        # Flush pending config save before exit
+        if self._save_pending:
+            self.after_cancel(self._save_pending)
+            self._flush_config()
+        self._io_executor.shutdown(wait=True)
+        if getattr(self, 'loop', None):
+            self._update_future.cancel()
+            loop_thread = _release_loop()
+            asyncio.run_coroutine_threadsafe(self._shutdown(loop_thread is not None), self.loop)
+            if loop_thread is not None:
+                # Let session/stream teardown finish and the loop close before the interpreter exits
+                loop_thread.join(LOOP_JOIN_TIMEOUT)
+            self.loop = None
         self.destroy()
 
 
@@ -327,6 +582,9 @@ class SettingsWindow(ctk.CTkToplevel):
         super().__init__(parent)
         self.parent = parent
 
+        # Debounced apply_* calls from variable traces: fn -> after() id
+        self._apply_pending: Dict[Callable, str] = {}
+
         self.title("⚙ Settings")
         self.configure(fg_color=COLORS['bg_dark'])
         self.resizable(False, False)
@@ -335,6 +593,24 @@ class SettingsWindow(ctk.CTkToplevel):
         self.after(10, self.center_window)
         self.grab_set()
 
+    def _queue_apply(self, fn: Callable):
+        """Debounce apply_* call (only the last change in a burst is applied)"""
+        handle = self._apply_pending.pop(fn, None)
+        if handle:
+            self.after_cancel(handle)
+        self._apply_pending[fn] = self.after(250, self._run_apply, fn)
+
+    def _run_apply(self, fn: Callable):
+        self._apply_pending.pop(fn, None)
+        fn()
+
+    def destroy(self):
+        # Apply changes still waiting in the debounce window
+        for fn, handle in list(self._apply_pending.items()):
+            self.after_cancel(handle)
+            self._run_apply(fn)
+        super().destroy()
+
     def center_window(self):
         self.update_idletasks()
         x = self.parent.winfo_x() + 50
@@ -372,7 +648,7 @@ class SettingsWindow(ctk.CTkToplevel):
                     font=ctk.CTkFont(size=11, weight="bold"),
                     text_color=COLORS['text_header']).pack(anchor="w")
         self.currency_var = ctk.StringVar(value=self.parent.config.get('currency', 'USD'))
-        self.currency_var.trace_add('write', lambda *a: self.apply_currency())
+        self.currency_var.trace_add('write', lambda *a: self._queue_apply(self.apply_currency))
         ctk.CTkOptionMenu(
             curr_frame, variable=self.currency_var,
             values=["USD", "EUR", "RUB", "UAH", "KZT"],
@@ -395,7 +671,7 @@ class SettingsWindow(ctk.CTkToplevel):
         interval_row = ctk.CTkFrame(interval_frame, fg_color="transparent")
         interval_row.pack(pady=(4, 0))
         self.interval_var = ctk.StringVar(value=str(self.parent.config.get('update_interval', 60)))
-        self.interval_var.trace_add('write', lambda *a: self.apply_interval())
+        self.interval_var.trace_add('write', lambda *a: self._queue_apply(self.apply_interval))
         ctk.CTkOptionMenu(
             interval_row, variable=self.interval_var,
             values=["10", "30", "60", "120", "300"],
@@ -424,19 +700,10 @@ class SettingsWindow(ctk.CTkToplevel):
                     font=ctk.CTkFont(size=11, weight="bold"),
                     text_color=COLORS['text_header']).pack(anchor="w")
         self.font_var = ctk.StringVar(value=self.parent.config.get('font_family', 'Arial'))
-        self.font_var.trace_add('write', lambda *a: self.apply_font())
+        self.font_var.trace_add('write', lambda *a: self._queue_apply(self.apply_font))
         
-        # Get ALL system fonts!
-        try:
-            all_fonts = list(tkfont.families())
-            # Filter: remove @-fonts and sort
-            fonts = sorted([f for f in all_fonts if not f.startswith('@')])
-            if not fonts:
-                # Fallback to popular
-                fonts = ["Arial", "Segoe UI", "Tahoma", "Verdana", "Consolas"]
-        except:
-            # Fallback to popular
-            fonts = ["Arial", "Segoe UI", "Tahoma", "Verdana", "Consolas"]
+        # Get ALL system fonts! (enumerated once per session)
+        fonts = _system_fonts()
         
         ctk.CTkOptionMenu(
             font_frame, variable=self.font_var, values=fonts,
@@ -454,7 +721,7 @@ class SettingsWindow(ctk.CTkToplevel):
                     font=ctk.CTkFont(size=11, weight="bold"),
                     text_color=COLORS['text_header']).pack(anchor="w")
         self.fontsize_var = ctk.StringVar(value=str(self.parent.config.get('font_size', 12)))
-        self.fontsize_var.trace_add('write', lambda *a: self.apply_font())
+        self.fontsize_var.trace_add('write', lambda *a: self._queue_apply(self.apply_font))
         ctk.CTkOptionMenu(
             size_frame, variable=self.fontsize_var,
             values=["9", "10", "11", "12", "13", "14", "16", "18"],
@@ -565,7 +832,7 @@ class SettingsWindow(ctk.CTkToplevel):
         section5 = self.create_section_frame("⚡ ADDITIONAL")
         
         self.ontop_var = ctk.BooleanVar(value=self.parent.config.get('always_on_top', False))
-        self.ontop_var.trace_add('write', lambda *a: self.apply_always_on_top())
+        self.ontop_var.trace_add('write', lambda *a: self._queue_apply(self.apply_always_on_top))
         
         ontop_cb = ctk.CTkCheckBox(
             section5, text="📌 Always on top",
@@ -640,23 +907,31 @@ class SettingsWindow(ctk.CTkToplevel):
         
         return section
 
-    def apply_tokens(self):
-        """Apply tokens"""
+    def apply_tokens(self) -> bool:
+        """Apply tokens
+
+        Returns:
+            True if token list changed (caller saves config)
+        """
         tokens_text = self.tokens_entry.get().strip()
         if tokens_text:
             new_tokens = [t.strip().upper() for t in tokens_text.split(',') if t.strip()]
             if new_tokens and new_tokens != self.parent.config['tokens']:
                 self.parent.config['tokens'] = new_tokens
-                self.parent.save_config()
                 self.parent.rebuild_ui()
-                asyncio.run_coroutine_threadsafe(self.parent.update_prices(), self.parent.loop)
+                self.parent._schedule_refresh()
                 print(f"✅ Tokens changed: {', '.join(new_tokens)}")
+                return True
+        return False
 
     def apply_currency(self):
         """Apply currency"""
-        self.parent.config['currency'] = self.currency_var.get()
+        currency = self.currency_var.get()
+        self.parent.config['currency'] = currency
+        self.parent._format_price = _make_formatter(currency)
         self.parent.save_config()
-        asyncio.run_coroutine_threadsafe(self.parent.update_prices(), self.parent.loop)
+        self.parent._paint_from_cache()
+        self.parent._schedule_refresh()
 
     def apply_interval(self):
         """Apply update interval"""
@@ -667,13 +942,22 @@ class SettingsWindow(ctk.CTkToplevel):
         """Apply font"""
         font_family = self.font_var.get()
         font_size = int(self.fontsize_var.get())
+
+        # Skip reconfigure if font didn't actually change
+        font_key = (font_family, font_size)
+        if font_key == self.parent._current_font_key:
+            return
+        self.parent._current_font_key = font_key
+
         self.parent.config['font_family'] = font_family
         self.parent.config['font_size'] = font_size
         self.parent.save_config()
 
+        bold_font = _get_font(font_family, font_size, True)
+        regular_font = _get_font(font_family, font_size, False)
         for token_data in self.parent.token_labels.values():
-            token_data['ticker'].configure(font=ctk.CTkFont(family=font_family, size=font_size, weight="bold"))
-            token_data['price'].configure(font=ctk.CTkFont(family=font_family, size=font_size))
+            token_data.ticker.configure(font=bold_font)
+            token_data.price.configure(font=regular_font)
 
         self.parent.update_window_size()
 
@@ -690,15 +974,22 @@ class SettingsWindow(ctk.CTkToplevel):
         self.parent.config['always_on_top'] = self.ontop_var.get()
         self.parent.save_config()
 
+    def ask_color(self, current_color: str, title: str):
+        """Open system color picker without holding the settings grab"""
+        # Release grab while modal picker is open, flush queued redraws after
+        self.grab_release()
+        try:
+            return colorchooser.askcolor(color=current_color, title=title)
+        finally:
+            self.update_idletasks()
+            self.grab_set()
+
     def choose_bg_color(self):
         """Open color picker for background"""
         current_color = self.parent.config.get('bg_color', '#0f1729')
         
         # Open system color picker
-        color = colorchooser.askcolor(
-            color=current_color,
-            title="Choose background color"
-        )
+        color = self.ask_color(current_color, "Choose background color")
         
         # color returns ((R,G,B), '#RRGGBB')
         if color and color[1]:
@@ -708,9 +999,7 @@ class SettingsWindow(ctk.CTkToplevel):
             self.bg_preview.configure(fg_color=new_color)
             
             # Apply color
-            self.parent.configure(fg_color=new_color)
-            self.parent.config['bg_color'] = new_color
-            self.parent.save_config()
+            self.parent.apply_bg_color(new_color)
             
             print(f"✅ Background color changed: {new_color}")
 
@@ -719,10 +1008,7 @@ class SettingsWindow(ctk.CTkToplevel):
         current_color = self.parent.config.get('text_color', '#ffffff')
         
         # Open system color picker
-        color = colorchooser.askcolor(
-            color=current_color,
-            title="Choose text color"
-        )
+        color = self.ask_color(current_color, "Choose text color")
         
         # color returns ((R,G,B), '#RRGGBB')
         if color and color[1]:
@@ -731,20 +1017,16 @@ class SettingsWindow(ctk.CTkToplevel):
             # Update preview
             self.text_preview.configure(fg_color=new_color)
             
-            # Apply color to all labels
-            for token_data in self.parent.token_labels.values():
-                token_data['ticker'].configure(text_color=new_color)
-                token_data['price'].configure(text_color=new_color)
-            
-            self.parent.config['text_color'] = new_color
-            self.parent.save_config()
+            # Apply color to all labels (coalesced with next redraw)
+            self.parent.after_idle(self.parent.apply_text_color, new_color)
             
             print(f"✅ Text color changed: {new_color}")
 
     def save_and_close(self):
         """Save and close"""
-        self.apply_tokens()
-        self.parent.save_config()
+        # Other settings are saved as they change; tokens save only if changed
+        if self.apply_tokens():
+            self.parent.save_config()
         print("✅ Settings saved")
         self.destroy()
 
@@ -754,6 +1036,9 @@ class SettingsWindow(ctk.CTkToplevel):
 # ================================================================================================
 
 def main():
+    # Price fetcher logs warnings only (info-level per-token logs are off)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
 
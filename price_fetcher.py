@@ -6,120 +6,696 @@ Uses logic from balance checker with multiple exchange support
 
 import aiohttp
 import asyncio
-from typing import Optional, Dict
+import functools
+import logging
+import orjson
+import random
+import time
+from collections import Counter, defaultdict, deque
+from types import MappingProxyType
+from typing import Any, Callable, Optional, Dict, DefaultDict, List, Mapping, Set, Tuple
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# How long a fetched price is reused (sec); matches the shortest update interval in the app
+PRICE_TTL = 10
+
+
+# Currencies we need rates for (sources that support filtering return only these)
+RATE_CURRENCIES = 'EUR,RUB,UAH,KZT,KRW'
+
+# Token mapping for CoinGecko (ID differs from ticker)
+COINGECKO_IDS: Mapping[str, str] = MappingProxyType({
+    'IRYS': 'irys',
+    'BTC': 'bitcoin',
+    'ETH': 'ethereum',
+    'BNB': 'binancecoin',
+    'SOL': 'solana',
+    'USDT': 'tether',
+    'USDC': 'usd-coin',
+    'XRP': 'ripple',
+    'ADA': 'cardano',
+    'AVAX': 'avalanche-2',
+    'DOT': 'polkadot',
+    'MATIC': 'matic-network',
+    'LINK': 'chainlink',
+    'UNI': 'uniswap',
+    'ATOM': 'cosmos',
+})
+
+# Fallback exchange rates (per USD) until fresh ones are fetched
+DEFAULT_EXCHANGE_RATES: Mapping[str, float] = MappingProxyType({
+    'USD': 1.0,
+    'EUR': 0.92,
+    'RUB': 92.0,
+    'UAH': 41.0,  # Ukrainian hryvnia
+    'KZT': 480.0,  # Kazakh tenge
+    'KRW': 1300.0  # Korean won (Upbit quotes)
+})
+
+# Currency symbols for format_price
+CURRENCY_SYMBOLS: Mapping[str, str] = MappingProxyType({
+    'USD': '$',
+    'EUR': '€',
+    'RUB': '₽',
+    'UAH': '₴',
+    'KZT': '₸',
+    'KRW': '₩'
+})
+
+# Free exchange rate sources without registration (updated once a day): (name, URL, rates key)
+RATE_SOURCES = [
+    ('ExchangeRate-API', 'https://api.exchangerate-api.com/v4/latest/USD', 'rates'),
+    # ECB data (no RUB/UAH/KZT; unsupported currencies in the filter fail the request)
+    ('Frankfurter', 'https://api.frankfurter.app/latest?from=USD', 'rates'),
+    ('ExchangeRate.host', f'https://api.exchangerate.host/latest?base=USD&symbols={RATE_CURRENCIES}', 'rates'),
+    ('Open.er-api', 'https://open.er-api.com/v6/latest/USD', 'rates'),
+]
+
+# How long fetched exchange rates are reused (sec)
+RATES_TTL = 3600
+
+# Max CoinGecko IDs per batch request (keeps URL length sane)
+COINGECKO_BATCH_SIZE = 100
+
+# CoinGecko rate limit (requests per minute) and max honoured Retry-After (sec)
+COINGECKO_RATE_PER_MIN = 30
+COINGECKO_MAX_RETRY_AFTER = 10
+
+
+class AsyncTokenBucket:
+    """Async token bucket rate limiter"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Max tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Circuit breaker: open after N consecutive failures, probe again after cooldown (sec)
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 10
+# Also open when the error rate over the last BREAKER_WINDOW calls reaches BREAKER_ERROR_RATE
+# (catches flapping exchanges that never fail N times in a row); needs BREAKER_MIN_CALLS samples
+BREAKER_WINDOW = 20
+BREAKER_MIN_CALLS = 10
+BREAKER_ERROR_RATE = 0.5
+
+
+class CircuitBreaker:
+    """Per-exchange circuit breaker (closed → open → half-open → closed)"""
+
+    def __init__(self):
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        # Recent outcomes (True = failure)
+        self._window: deque = deque(maxlen=BREAKER_WINDOW)
+
+    def allow(self) -> bool:
+        """Check if a request may be sent now"""
+        if self.state == 'closed':
+            return True
+        now = time.monotonic()
+        if now - self.opened_at >= BREAKER_COOLDOWN:
+            # Let one probe request through; if it never reports back (e.g. cancelled
+            # by a faster exchange), another probe is allowed after the next cooldown
+            self.state = 'half_open'
+            self.opened_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.state == 'half_open':
+            # Recovered: start the error rate from scratch
+            self._window.clear()
+        self.state = 'closed'
+        self.failures = 0
+        self._window.append(False)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._window.append(True)
+        if (self.state == 'half_open' or self.failures >= BREAKER_THRESHOLD
+                or self._error_rate_exceeded()):
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+
+    def _error_rate_exceeded(self) -> bool:
+        calls = len(self._window)
+        return calls >= BREAKER_MIN_CALLS and sum(self._window) / calls >= BREAKER_ERROR_RATE
+
+
+def _safe(parse: Callable[[Any], float]) -> Callable[[Any], Optional[float]]:
+    """Wrap response parser: missing fields / unexpected format -> None"""
+    def parser(data: Any) -> Optional[float]:
+        try:
+            return parse(data)
+        except (KeyError, IndexError, TypeError, ValueError, StopIteration):
+            return None
+    return parser
+
+
+# MEXC and OKX share the same ticker format
+_parse_data_last = _safe(lambda d: float(d['data'][0]['last']))
+
+# Response parsers per exchange (JSON -> price in the exchange's quote currency)
+PARSERS: Dict[str, Callable[[Any], Optional[float]]] = {
+    'Binance': _safe(lambda d: float(d['price'])),
+    'MEXC': _parse_data_last,
+    'OKX': _parse_data_last,
+    'Bybit': _safe(lambda d: float(d['result']['list'][0]['lastPrice'])),
+    'Gate.io': _safe(lambda d: float(d[0]['last'])),
+    'KuCoin': _safe(lambda d: float(d['data']['price'])),
+    'HTX': _safe(lambda d: float(d['tick']['close'])),
+    'Coinbase': _safe(lambda d: float(d['data']['amount'])),
+    'Bitget': _safe(lambda d: float(d['data']['close'])),
+    'Bitfinex': _safe(lambda d: float(d[6])),
+    'Kraken': _safe(lambda d: float(next(iter(d['result'].values()))['c'][0])),
+    'Upbit': _safe(lambda d: float(d[0]['trade_price'])),
+}
+
+# Exchanges quoting in a currency other than USD/USDT (converted with live exchange rates)
+QUOTE_CURRENCIES: Mapping[str, str] = MappingProxyType({
+    'Upbit': 'KRW',
+})
+
+# Fallback exchanges in priority order: (name, ticker URL template, parser)
+# Template fields: {u} = symbol as given, {l} = lower case symbol
+EXCHANGES: List[Tuple[str, str, Callable[[Any], Optional[float]]]] = [
+    ('Binance', 'https://api.binance.com/api/v3/ticker/price?symbol={u}USDT', PARSERS['Binance']),
+    ('MEXC', 'https://www.mexc.com/open/api/v2/market/ticker?symbol={u}_USDT', PARSERS['MEXC']),
+    ('OKX', 'https://www.okx.com/api/v5/market/ticker?instId={u}-USDT', PARSERS['OKX']),
+    ('Bybit', 'https://api.bybit.com/v5/market/tickers?category=spot&symbol={u}USDT', PARSERS['Bybit']),
+    ('Gate.io', 'https://api.gateio.ws/api/v4/spot/tickers?currency_pair={u}_USDT', PARSERS['Gate.io']),
+    ('KuCoin', 'https://api.kucoin.com/api/v1/market/orderbook/level1?symbol={u}-USDT', PARSERS['KuCoin']),
+    ('HTX', 'https://api.huobi.pro/market/detail/merged?symbol={l}usdt', PARSERS['HTX']),
+    ('Coinbase', 'https://api.coinbase.com/v2/prices/{u}-USD/spot', PARSERS['Coinbase']),
+    ('Bitget', 'https://api.bitget.com/api/spot/v1/market/ticker?symbol={u}USDT_SPBL', PARSERS['Bitget']),
+    ('Bitfinex', 'https://api-pub.bitfinex.com/v2/ticker/t{u}USD', PARSERS['Bitfinex']),
+    ('Kraken', 'https://api.kraken.com/0/public/Ticker?pair={u}USD', PARSERS['Kraken']),
+    ('Upbit', 'https://api.upbit.com/v1/ticker?markets=KRW-{u}', PARSERS['Upbit']),
+]
+
+
+# Default request timeout; short connect timeout so a stalled TLS handshake fails fast
+SESSION_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=2, sock_read=8)
+# Tighter budget for a single exchange in the fallback race (one shared object, no per-call allocation)
+EXCHANGE_TIMEOUT = aiohttp.ClientTimeout(total=3, connect=2)
+
+
+# Retries for transient HTTP failures: status codes, attempts, backoff base / cap (sec)
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP_RETRIES = 2
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 1.0
+
+
+@functools.lru_cache(maxsize=8)
+def _attempt_timeout(timeout: aiohttp.ClientTimeout) -> aiohttp.ClientTimeout:
+    """Per-attempt timeout: an equal share of timeout.total, so a timed-out attempt leaves room to retry"""
+    share = timeout.total / (HTTP_RETRIES + 1)
+    return aiohttp.ClientTimeout(
+        total=share,
+        connect=min(timeout.connect or share, share),
+        sock_read=min(timeout.sock_read or share, share),
+    )
+
+# Max response body size (bytes); larger bodies (HTML error pages, full ticker lists) are rejected
+MAX_BODY_BYTES = 64 * 1024
+
+# Max concurrent exchange requests per fetcher (below the connector pool limit)
+MAX_EXCHANGE_REQUESTS = 64
+
+
+async def _read_capped(response: aiohttp.ClientResponse, limit: int = MAX_BODY_BYTES) -> Optional[bytes]:
+    """Read response body up to limit bytes; None if the body is larger"""
+    if response.content_length is not None and response.content_length > limit:
+        return None
+
+    chunks = []
+    size = 0
+    while True:
+        chunk = await response.content.read(limit + 1 - size)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return None
+
+
+# Shared HTTP session (keep-alive connections reused across PriceFetcher instances)
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create HTTP session with tuned connection pool"""
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=10,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=SESSION_TIMEOUT)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Get shared HTTP session (created on first use, must be called inside the event loop)"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = _create_session()
+    return _SESSION
+
+
+async def close_session() -> None:
+    """Close shared HTTP session"""
+    global _SESSION
+    if _SESSION is not None:
+        await _SESSION.close()
+        _SESSION = None
+
+
+# Streamed prices older than this (sec) are ignored and REST is used instead
+WS_PRICE_TTL = 5
+# Delay before reconnecting a dropped stream (sec)
+WS_RECONNECT_DELAY = 5
+# Keepalive interval (sec); Bybit and OKX drop idle connections after 30 s
+WS_PING_INTERVAL = 20
+# Reconnect if nothing (ticks, pongs) arrives for this long; catches half-open connections
+WS_RECEIVE_TIMEOUT = 2 * WS_PING_INTERVAL
+WS_TIMEOUT = aiohttp.ClientWSTimeout(ws_receive=WS_RECEIVE_TIMEOUT)
+# Bybit accepts at most 10 topics per (un)subscribe request
+BYBIT_SUBSCRIBE_BATCH = 10
+
+
+# Request builders: (symbols, op) -> messages; op is 'subscribe' or 'unsubscribe'
+def _binance_requests(symbols: List[str], op: str) -> List[dict]:
+    return [{'method': op.upper(), 'params': [f'{s.lower()}usdt@miniTicker' for s in symbols], 'id': 1}]
+
+
+def _bybit_requests(symbols: List[str], op: str) -> List[dict]:
+    return [
+        {'op': op, 'args': [f'tickers.{s}USDT' for s in symbols[i:i + BYBIT_SUBSCRIBE_BATCH]]}
+        for i in range(0, len(symbols), BYBIT_SUBSCRIBE_BATCH)
+    ]
+
+
+def _okx_requests(symbols: List[str], op: str) -> List[dict]:
+    return [{'op': op, 'args': [{'channel': 'tickers', 'instId': f'{s}-USDT'} for s in symbols]}]
+
+
+def _binance_tick(msg: Any) -> List[Tuple[str, float]]:
+    if msg.get('e') == '24hrMiniTicker' and msg['s'].endswith('USDT'):
+        return [(msg['s'][:-4], float(msg['c']))]
+    return []
+
+
+def _bybit_tick(msg: Any) -> List[Tuple[str, float]]:
+    data = msg.get('data')
+    if msg.get('topic', '').startswith('tickers.') and data['symbol'].endswith('USDT'):
+        return [(data['symbol'][:-4], float(data['lastPrice']))]
+    return []
+
+
+def _okx_tick(msg: Any) -> List[Tuple[str, float]]:
+    if msg.get('arg', {}).get('channel') != 'tickers' or 'data' not in msg:
+        return []
+    return [(d['instId'].split('-')[0], float(d['last'])) for d in msg['data'] if d['instId'].endswith('-USDT')]
+
+
+# Streaming exchanges (USDT tickers): (name, URL, request builder, tick parser, ping text)
+# Ping text is an application-level keepalive; None means WebSocket ping frames are enough
+WS_EXCHANGES: List[Tuple[str, str, Callable[[List[str], str], List[dict]],
+                         Callable[[Any], List[Tuple[str, float]]], Optional[str]]] = [
+    ('Binance', 'wss://stream.binance.com:9443/ws', _binance_requests, _binance_tick, None),
+    ('Bybit', 'wss://stream.bybit.com/v5/public/spot', _bybit_requests, _bybit_tick, '{"op":"ping"}'),
+    ('OKX', 'wss://ws.okx.com:8443/ws/v5/public', _okx_requests, _okx_tick, 'ping'),
+]
+
+
+class WSPriceStream:
+    """Live ticker prices over one WebSocket per exchange (started on first subscribe)"""
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+        # Latest streamed price: symbol -> (price_usd, monotonic timestamp)
+        self._prices: Dict[str, Tuple[float, float]] = {}
+        # Subscribed symbols with the number of subscribers (unsubscribed when it drops to zero)
+        self._symbols: Counter = Counter()
+        # Open sockets by exchange name (symbol changes are sent on them directly)
+        self._sockets: Dict[str, aiohttp.ClientWebSocketResponse] = {}
+        self._tasks: List[asyncio.Task] = []
+        # In-flight (un)subscribe requests on already open sockets
+        self._pending: Set[asyncio.Task] = set()
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """Get streamed USD price if younger than WS_PRICE_TTL"""
+        entry = self._prices.get(symbol)
+        if entry and time.monotonic() - entry[1] < WS_PRICE_TTL:
+            return entry[0]
+        return None
+
+    def subscribe(self, symbols) -> None:
+        """Add one subscriber to each symbol (must be called inside the event loop)"""
+        new = []
+        for symbol in {symbol.upper() for symbol in symbols}:
+            if not self._symbols[symbol]:
+                new.append(symbol)
+            self._symbols[symbol] += 1
+        if not new:
+            return
+
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run(*exchange)) for exchange in WS_EXCHANGES]
+            return
+        self._send_all(sorted(new), 'subscribe')
+
+    def unsubscribe(self, symbols) -> None:
+        """Drop one subscriber from each symbol; symbols nobody needs leave the streams"""
+        gone = []
+        for symbol in {symbol.upper() for symbol in symbols}:
+            if not self._symbols[symbol]:
+                continue
+            self._symbols[symbol] -= 1
+            if not self._symbols[symbol]:
+                del self._symbols[symbol]
+                self._prices.pop(symbol, None)
+                gone.append(symbol)
+        if gone:
+            self._send_all(sorted(gone), 'unsubscribe')
+
+    def _send_all(self, symbols: List[str], op: str) -> None:
+        """Send (un)subscribe requests on every open socket"""
+        for name, _, make_requests, _, _ in WS_EXCHANGES:
+            ws = self._sockets.get(name)
+            if ws is not None:
+                task = asyncio.create_task(self._send_requests(ws, make_requests, symbols, op))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+    async def close(self) -> None:
+        """Stop all streams"""
+        tasks = self._tasks + list(self._pending)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._sockets.clear()
+
+    @staticmethod
+    async def _send_requests(ws: aiohttp.ClientWebSocketResponse, make_requests: Callable[[List[str], str], List[dict]],
+                             symbols: List[str], op: str) -> None:
+        if not symbols:
+            return
+        try:
+            for message in make_requests(symbols, op):
+                await ws.send_str(orjson.dumps(message).decode())
+        except (aiohttp.ClientError, ConnectionError, RuntimeError):
+            # Socket dropped; symbols are resubscribed on reconnect
+            pass
+
+    async def _run(self, name: str, url: str, make_requests: Callable[[List[str], str], List[dict]],
+                   parse: Callable[[Any], List[Tuple[str, float]]], ping: Optional[str]) -> None:
+        """Keep one exchange stream connected, reconnecting after errors"""
+        while True:
+            try:
+                async with self.session.ws_connect(
+                    url, heartbeat=None if ping else WS_PING_INTERVAL, timeout=WS_TIMEOUT
+                ) as ws:
+                    # Register before subscribing so symbols added meanwhile go straight to this socket
+                    self._sockets[name] = ws
+                    keepalive = asyncio.create_task(self._keepalive(ws, ping)) if ping else None
+                    try:
+                        await self._send_requests(ws, make_requests, sorted(self._symbols), 'subscribe')
+                        logger.debug("📡 %s stream connected", name)
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self._on_message(parse, msg.data)
+                            elif msg.type == aiohttp.WSMsgType.ERROR:
+                                break
+                    finally:
+                        self._sockets.pop(name, None)
+                        if keepalive:
+                            keepalive.cancel()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as e:
+                logger.debug("⚠️ %s stream error: %s", name, str(e) or type(e).__name__)
+            except Exception:
+                # Bug or unexpected frame: keep the stream alive (CancelledError still stops it)
+                logger.warning("❌ %s stream failed, reconnecting", name, exc_info=True)
+
+            await asyncio.sleep(WS_RECONNECT_DELAY)
+
+    @staticmethod
+    async def _keepalive(ws: aiohttp.ClientWebSocketResponse, ping: str) -> None:
+        """Send application-level pings"""
+        try:
+            while not ws.closed:
+                await asyncio.sleep(WS_PING_INTERVAL)
+                await ws.send_str(ping)
+        except (aiohttp.ClientError, ConnectionError, RuntimeError):
+            # Socket dropped; the reader loop reconnects
+            pass
+
+    def _on_message(self, parse: Callable[[Any], List[Tuple[str, float]]], data: str) -> None:
+        """Store prices from one stream message (acks, pongs and errors are skipped)"""
+        try:
+            ticks = parse(orjson.loads(data))
+        except (orjson.JSONDecodeError, AttributeError, KeyError, IndexError, TypeError, ValueError):
+            return
+        now = time.monotonic()
+        for symbol, price in ticks:
+            if symbol in self._symbols and price > 0:
+                self._prices[symbol] = (price, now)
+
+
+# Shared price stream on the shared HTTP session (one set of sockets for all fetchers)
+_WS_STREAM: Optional[WSPriceStream] = None
+_WS_STREAM_USERS = 0
+
+
+def _acquire_stream() -> WSPriceStream:
+    """Get shared price stream (created on first use, must be called inside the event loop)"""
+    global _WS_STREAM, _WS_STREAM_USERS
+    if _WS_STREAM is None:
+        _WS_STREAM = WSPriceStream(get_session())
+    _WS_STREAM_USERS += 1
+    return _WS_STREAM
+
+
+async def _release_stream() -> None:
+    """Drop one user of the shared price stream; the last one stops it"""
+    global _WS_STREAM, _WS_STREAM_USERS
+    _WS_STREAM_USERS -= 1
+    if _WS_STREAM_USERS > 0 or _WS_STREAM is None:
+        return
+    stream, _WS_STREAM = _WS_STREAM, None
+    await stream.close()
+
 
 class PriceFetcher:
     """Class for fetching token prices from various sources"""
 
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-
-        # Token mapping for CoinGecko (ID differs from ticker)
-        self.coingecko_ids = {
-            'IRYS': 'irys',
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'BNB': 'binancecoin',
-            'SOL': 'solana',
-            'USDT': 'tether',
-            'USDC': 'usd-coin',
-            'XRP': 'ripple',
-            'ADA': 'cardano',
-            'AVAX': 'avalanche-2',
-            'DOT': 'polkadot',
-            'MATIC': 'matic-network',
-            'LINK': 'chainlink',
-            'UNI': 'uniswap',
-            'ATOM': 'cosmos',
-        }
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None, quiet: bool = False,
+                 stream_prices: bool = False):
+        """
+        Args:
+            session: Externally owned HTTP session (e.g. get_session()). If not given,
+                     the fetcher creates its own on context enter and closes it on exit.
+            quiet: Suppress info-level logging (warnings are still logged)
+            stream_prices: Keep requested tokens subscribed over exchange WebSockets
+                           (for long-lived fetchers). The stream is shared by all fetchers
+                           and runs on the shared session (get_session(); close it with
+                           close_session()); it stops when the last fetcher exits.
+        """
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self.quiet = quiet
+        self.stream_prices = stream_prices
+        self._ws_stream: Optional[WSPriceStream] = None
+        # Symbols this fetcher subscribed (get_multiple_prices keeps it equal to the last requested list)
+        self._streamed: Set[str] = set()
 
-        # Exchange rates (updated on request)
-        self.exchange_rates = {
-            'USD': 1.0,
-            'EUR': 0.92,
-            'RUB': 92.0,
-            'UAH': 41.0,  # Ukrainian hryvnia
-            'KZT': 480.0  # Kazakh tenge
-        }
+        # Price cache: symbol -> (price_usd, monotonic timestamp)
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Cached symbols priced via a non-USD quote (dropped when rates change)
+        self._fx_priced: Set[str] = set()
+
+        # CoinGecko free tier allows ~30 requests/min
+        self._cg_bucket = AsyncTokenBucket(rate=COINGECKO_RATE_PER_MIN / 60, capacity=COINGECKO_RATE_PER_MIN)
+
+        # Bound in-flight exchange requests (many tokens x 12 exchanges)
+        self._exchange_sem = asyncio.Semaphore(MAX_EXCHANGE_REQUESTS)
+
+        # Circuit breakers per exchange name
+        self._breakers: DefaultDict[str, CircuitBreaker] = defaultdict(CircuitBreaker)
+
+        # Token mapping for CoinGecko (shared, read-only)
+        self.coingecko_ids = COINGECKO_IDS
+
+        # Exchange rates (updated on request, at most once per RATES_TTL)
+        self._rates_ts = 0.0
+        self.exchange_rates = dict(DEFAULT_EXCHANGE_RATES)
+
+    def _info(self, msg: str, *args) -> None:
+        """Log info message unless fetcher is quiet"""
+        if not self.quiet:
+            logger.info(msg, *args)
 
     async def __aenter__(self):
-        """Create session on context enter"""
-        self.session = aiohttp.ClientSession()
+        """Create session on context enter (unless one was injected)"""
+        if self.session is None:
+            self.session = _create_session()
+        if self.stream_prices and self._ws_stream is None:
+            self._ws_stream = _acquire_stream()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Close session on context exit"""
-        if self.session:
+        """Release price stream and close session on context exit (only if the fetcher owns it)"""
+        if self._ws_stream:
+            self._ws_stream.unsubscribe(self._streamed)
+            self._streamed.clear()
+            self._ws_stream = None
+            await _release_stream()
+        if self.session and self._owns_session:
             await self.session.close()
 
     async def update_exchange_rates(self) -> None:
-        """Обновление курсов валют через API с fallback на несколько источников"""
+        """Обновление курсов валют через API (все источники параллельно, кэш на RATES_TTL)"""
 
-        print("\n" + "=" * 50)
-        print("💱 ОБНОВЛЕНИЕ КУРСОВ ВАЛЮТ")
-        print("=" * 50)
+        # Курсы ещё свежие - сеть не трогаем
+        if self._rates_ts and time.monotonic() - self._rates_ts < RATES_TTL:
+            return
 
-        # Список БЕСПЛАТНЫХ источников без регистрации (обновляются раз в сутки)
-        sources = [
-            ('ExchangeRate-API', 'https://api.exchangerate-api.com/v4/latest/USD', 'rates'),
-            ('Frankfurter', 'https://api.frankfurter.app/latest?from=USD', 'rates'),
-            ('ExchangeRate.host', 'https://api.exchangerate.host/latest?base=USD', 'rates'),
-            ('Open.er-api', 'https://open.er-api.com/v6/latest/USD', 'rates'),
+        self._info("💱 ОБНОВЛЕНИЕ КУРСОВ ВАЛЮТ")
+
+        # Опрашиваем все источники сразу и объединяем ответы, пока не покроем все валюты
+        # (источник может вернуть не все, например у Frankfurter нет RUB/UAH/KZT)
+        tasks = [
+            asyncio.create_task(self._try_rate_source(source_name, url, rates_key))
+            for source_name, url, rates_key in RATE_SOURCES
         ]
+        needed = set(RATE_CURRENCIES.split(','))
+        rates: Dict[str, float] = {}
+        sources = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if not result:
+                    continue
+                source_name, source_rates = result
+                new = {currency: rate for currency, rate in source_rates.items() if currency not in rates}
+                if new:
+                    rates.update(new)
+                    sources.append(source_name)
+                if needed <= rates.keys():
+                    break
+        finally:
+            # Отменяем медленные источники
+            for task in tasks:
+                task.cancel()
 
-        for source_name, url, rates_key in sources:
-            print(f"🔄 Пробуем {source_name}...")
+        if rates:
+            self.exchange_rates.update(rates)
 
-            try:
-                async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # Проверяем наличие ключа с курсами
-                        if rates_key in data:
-                            rates = data[rates_key]
-
-                            # Обновляем курсы
-                            self.exchange_rates['EUR'] = rates.get('EUR', self.exchange_rates['EUR'])
-                            self.exchange_rates['RUB'] = rates.get('RUB', self.exchange_rates['RUB'])
-                            self.exchange_rates['UAH'] = rates.get('UAH', self.exchange_rates['UAH'])
-                            self.exchange_rates['KZT'] = rates.get('KZT', self.exchange_rates['KZT'])
-
-                            print(f"✅ Курсы получены от {source_name}!")
-                            print(f"   EUR: {self.exchange_rates['EUR']:.4f}")
-                            print(f"   RUB: {self.exchange_rates['RUB']:.2f}")
-                            print(f"   UAH: {self.exchange_rates['UAH']:.2f}")
-                            print(f"   KZT: {self.exchange_rates['KZT']:.2f}")
-                            print("=" * 50)
-                            return  # Успешно получили - выходим
-                        else:
-                            print(f"⚠️ {source_name}: неверный формат ответа (нет ключа '{rates_key}')")
-                    else:
-                        print(f"⚠️ {source_name}: HTTP {response.status}")
-
-            except asyncio.TimeoutError:
-                print(f"⚠️ {source_name}: таймаут (>10 сек)")
-            except Exception as e:
-                print(f"⚠️ {source_name}: ошибка - {e}")
+            # Цены, пересчитанные по старому курсу (Upbit KRW), больше не актуальны
+            for key in self._fx_priced:
+                self._price_cache.pop(key, None)
+            self._fx_priced.clear()
+
+        if needed <= rates.keys():
+            # Кэшируем только полный набор курсов
+            self._rates_ts = time.monotonic()
+            self._info("✅ Курсы получены от %s! %s", ', '.join(sources), self._rates_summary())
+            return
+
+        if rates:
+            logger.warning(
+                "⚠️ Неполные курсы (%s), нет: %s - повторим при следующем обновлении",
+                ', '.join(sources), ', '.join(sorted(needed - rates.keys()))
+            )
+            return
 
         # Если ВСЕ источники упали
-        print(f"\n❌ ВСЕ ИСТОЧНИКИ НЕДОСТУПНЫ!")
-        print(f"📦 Используются кэшированные значения:")
-        print(f"   EUR: {self.exchange_rates['EUR']:.4f}")
-        print(f"   RUB: {self.exchange_rates['RUB']:.2f}")
-        print(f"   UAH: {self.exchange_rates['UAH']:.2f}")
-        print(f"   KZT: {self.exchange_rates['KZT']:.2f}")
-        print("=" * 50)
+        logger.warning("❌ ВСЕ ИСТОЧНИКИ НЕДОСТУПНЫ! Используются кэшированные значения: %s", self._rates_summary())
 
-    async def get_token_price(self, token_symbol: str) -> Optional[float]:
+    def _rates_summary(self) -> str:
+        """Курсы всех валют из RATE_CURRENCIES для логов (мелкие курсы с 4 знаками)"""
+        parts = []
+        for currency in RATE_CURRENCIES.split(','):
+            rate = self.exchange_rates[currency]
+            parts.append(f"{currency}: {rate:.4f}" if rate < 10 else f"{currency}: {rate:.2f}")
+        return ', '.join(parts)
+
+    async def _try_rate_source(self, source_name: str, url: str,
+                               rates_key: str) -> Optional[Tuple[str, Dict[str, float]]]:
+        """
+        Запрос курсов у одного источника
+
+        Returns:
+            (имя источника, {валюта: курс}) или None при ошибке
+        """
+        logger.debug("🔄 Пробуем %s...", source_name)
+
+        try:
+            status, body = await self._get_with_retry(url)
+            if status != 200:
+                logger.warning("⚠️ %s: HTTP %s", source_name, status)
+                return None
+            if body is None:
+                logger.warning("⚠️ %s: ответ больше %d байт", source_name, MAX_BODY_BYTES)
+                return None
+            data = orjson.loads(body)
+
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ %s: таймаут (>10 сек)", source_name)
+            return None
+        except Exception as e:
+            logger.warning("⚠️ %s: ошибка - %s", source_name, e)
+            return None
+
+        # Проверяем наличие ключа с курсами
+        if rates_key not in data:
+            logger.warning("⚠️ %s: неверный формат ответа (нет ключа '%s')", source_name, rates_key)
+            return None
+
+        rates = data[rates_key]
+        return source_name, {
+            currency: rates[currency]
+            for currency in self.exchange_rates
+            if currency != 'USD' and currency in rates
+        }
+
+    async def get_token_price(self, token_symbol: str, use_coingecko: bool = True) -> Optional[float]:
         """
         Get token price in USD.
-        Priority: CoinGecko → Exchanges (13 sources)
+        Priority: WebSocket stream → cache → CoinGecko → Exchanges (13 sources)
 
         Args:
             token_symbol: Token symbol (e.g., 'ETH', 'BTC')
+            use_coingecko: Query CoinGecko before exchanges (False if it was already asked)
 
         Returns:
             Price in USD or None if failed to retrieve
@@ -128,95 +704,281 @@ class PriceFetcher:
         if not self.session:
             raise RuntimeError("Session not initialized. Use 'async with PriceFetcher()' context manager.")
 
+        key = token_symbol.upper()
+        price = self._live_price(key)
+        if price is not None:
+            return price
+
+        # First REST request for a token subscribes it to the live streams
+        if self._ws_stream and key not in self._streamed:
+            self._streamed.add(key)
+            self._ws_stream.subscribe((key,))
+
+        # Single-flight: concurrent requests for the same token share one fetch
+        async with self._locks[key]:
+            price = self._cached_price(key)
+            if price is not None:
+                return price
+
+            price = await self._fetch_token_price(token_symbol, use_coingecko)
+            if price:
+                self._price_cache[key] = (price, time.monotonic())
+            return price
+
+    def _live_price(self, key: str) -> Optional[float]:
+        """Get fresh streamed price, falling back to the REST cache"""
+        if self._ws_stream:
+            price = self._ws_stream.get_price(key)
+            if price is not None:
+                return price
+        return self._cached_price(key)
+
+    def _cached_price(self, key: str) -> Optional[float]:
+        """Get cached USD price if younger than PRICE_TTL"""
+        entry = self._price_cache.get(key)
+        if entry and time.monotonic() - entry[1] < PRICE_TTL:
+            return entry[0]
+        return None
+
+    async def _fetch_token_price(self, token_symbol: str, use_coingecko: bool) -> Optional[float]:
+        """Fetch token price from network: CoinGecko first, then exchanges"""
         # 1. PRIORITY: CoinGecko (aggregator)
-        coingecko_id = self.coingecko_ids.get(token_symbol.upper(), token_symbol.lower())
-        url = f'https://api.coingecko.com/api/v3/simple/price?ids={coingecko_id}&vs_currencies=usd'
+        if use_coingecko:
+            coingecko_id = self.coingecko_ids.get(token_symbol.upper(), token_symbol.lower())
+            url = f'https://api.coingecko.com/api/v3/simple/price?ids={coingecko_id}&vs_currencies=usd'
+
+            try:
+                data = await self._coingecko_get(url)
+                if data and coingecko_id in data and 'usd' in data[coingecko_id]:
+                    price = data[coingecko_id]['usd']
+                    self._info("✅ %s: $%s (CoinGecko)", token_symbol, price)
+                    return price
+            except Exception as e:
+                logger.warning("⚠️ CoinGecko unavailable for %s: %s", token_symbol, e)
 
+        # 2. FALLBACK: Exchange iteration
+        symbol_lower = token_symbol.lower()
+        # Query all exchanges at once (skipping ones with open circuit), first valid price wins
+        tasks = {
+            asyncio.create_task(
+                self._fetch_and_parse(exchange_name, template.format(u=token_symbol, l=symbol_lower), parser)
+            ): exchange_name
+            for exchange_name, template, parser in EXCHANGES
+            if self._breakers[exchange_name].allow()
+        }
         try:
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if coingecko_id in data and 'usd' in data[coingecko_id]:
-                        price = data[coingecko_id]['usd']
-                        print(f"✅ {token_symbol}: ${price} (CoinGecko)")
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exchange_name = tasks.pop(task)
+                    price = task.result()
+                    if price:
+                        if exchange_name in QUOTE_CURRENCIES:
+                            self._fx_priced.add(token_symbol.upper())
+                        self._info("✅ %s: $%s (%s)", token_symbol, price, exchange_name)
                         return price
-        except Exception as e:
-            print(f"⚠️ CoinGecko unavailable for {token_symbol}: {e}")
+        finally:
+            # Cancel slower exchanges
+            for task in tasks:
+                task.cancel()
 
-        # 2. FALLBACK: Exchange iteration
-        exchanges = [
-            ('Binance', f'https://api.binance.com/api/v3/ticker/price?symbol={token_symbol}USDT'),
-            ('MEXC', f'https://www.mexc.com/open/api/v2/market/ticker?symbol={token_symbol}_USDT'),
-            ('OKX', f'https://www.okx.com/api/v5/market/ticker?instId={token_symbol}-USDT'),
-            ('Bybit', f'https://api.bybit.com/v5/market/tickers?category=spot&symbol={token_symbol}USDT'),
-            ('Gate.io', f'https://api.gateio.ws/api/v4/spot/tickers?currency_pair={token_symbol}_USDT'),
-            ('KuCoin', f'https://api.kucoin.com/api/v1/market/orderbook/level1?symbol={token_symbol}-USDT'),
-            ('HTX', f'https://api.huobi.pro/market/detail/merged?symbol={token_symbol.lower()}usdt'),
-            ('Coinbase', f'https://api.coinbase.com/v2/prices/{token_symbol}-USD/spot'),
-            ('Bitget', f'https://api.bitget.com/api/spot/v1/market/ticker?symbol={token_symbol}USDT_SPBL'),
-            ('Bitfinex', f'https://api-pub.bitfinex.com/v2/ticker/t{token_symbol}USD'),
-            ('Kraken', f'https://api.kraken.com/0/public/Ticker?pair={token_symbol}USD'),
-            ('Upbit', f'https://api.upbit.com/v1/ticker?markets=KRW-{token_symbol}'),
-        ]
+        logger.warning("❌ Failed to get price for %s", token_symbol)
+        return None
 
-        for exchange_name, url in exchanges:
-            try:
-                async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        # Parse response depending on exchange
-                        price = None
-                        if exchange_name == 'Binance':
-                            price = float(data['price'])
-                        elif exchange_name == 'MEXC':
-                            price = float(data['data'][0]['last']) if 'data' in data and len(data['data']) > 0 else None
-                        elif exchange_name == 'OKX':
-                            price = float(data['data'][0]['last']) if 'data' in data and len(data['data']) > 0 else None
-                        elif exchange_name == 'Bybit':
-                            price = float(data['result']['list'][0]['lastPrice']) if 'result' in data else None
-                        elif exchange_name == 'Gate.io':
-                            price = float(data[0]['last']) if len(data) > 0 else None
-                        elif exchange_name == 'KuCoin':
-                            price = float(data['data']['price']) if 'data' in data else None
-                        elif exchange_name == 'HTX':
-                            price = float(data['tick']['close']) if 'tick' in data else None
-                        elif exchange_name == 'Coinbase':
-                            price = float(data['data']['amount'])
-                        elif exchange_name == 'Bitget':
-                            price = float(data['data']['close']) if 'data' in data else None
-                        elif exchange_name == 'Bitfinex':
-                            price = float(data[6]) if len(data) > 6 else None
-                        elif exchange_name == 'Kraken':
-                            pair_key = list(data['result'].keys())[0]
-                            price = float(data['result'][pair_key]['c'][0])
-                        elif exchange_name == 'Upbit':
-                            price = float(data[0]['trade_price']) / 1300 if len(data) > 0 else None  # KRW -> USD
-
-                        if price:
-                            print(f"✅ {token_symbol}: ${price} ({exchange_name})")
-                            return price
+    async def _fetch_and_parse(self, exchange_name: str, url: str,
+                               parser: Callable[[Any], Optional[float]]) -> Optional[float]:
+        """
+        Fetch ticker from one exchange and parse price
 
-            except Exception as e:
-                # Silently skip unavailable exchanges
-                continue
+        Args:
+            exchange_name: Exchange name (circuit breaker key)
+            url: Ticker URL
+            parser: Extracts USD price from the exchange response
 
-        print(f"❌ Failed to get price for {token_symbol}")
-        return None
+        Returns:
+            Price in USD or None if exchange unavailable / token not listed
+        """
+        breaker = self._breakers[exchange_name]
+        try:
+            async with self._exchange_sem:
+                status, body = await self._get_with_retry(url, EXCHANGE_TIMEOUT)
+
+            # Server errors / rate limiting (still failing after retries) count against the exchange,
+            # other non-200 (e.g. token not listed) mean the exchange is up
+            if status in RETRYABLE_STATUSES:
+                breaker.record_failure()
+                return None
+            breaker.record_success()
+            if status != 200 or body is None:
+                return None
+            price = parser(orjson.loads(body))
+
+            # Quote currency -> USD
+            quote = QUOTE_CURRENCIES.get(exchange_name)
+            if price and quote:
+                price /= self.exchange_rates[quote]
+            return price
+
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Exchange unreachable
+            breaker.record_failure()
+            return None
+        except Exception:
+            # Unexpected response format - skip silently
+            return None
+
+    async def _get_with_retry(self, url: str,
+                              timeout: aiohttp.ClientTimeout = SESSION_TIMEOUT) -> Tuple[int, Optional[bytes]]:
+        """
+        GET with retries on transient failures (429/5xx, timeouts, connection errors)
+
+        Backoff is exponential with full jitter; Retry-After is honoured (capped).
+        timeout.total bounds all attempts together; each attempt gets an equal share of it.
+
+        Returns:
+            (HTTP status, body) of the last attempt; body is None if larger than MAX_BODY_BYTES
+
+        Raises:
+            aiohttp.ClientError if the last attempt failed to connect,
+            asyncio.TimeoutError if the overall budget ran out
+        """
+        return await asyncio.wait_for(self._get_attempts(url, timeout), timeout.total)
+
+    async def _get_attempts(self, url: str, timeout: aiohttp.ClientTimeout) -> Tuple[int, Optional[bytes]]:
+        """Retry loop of _get_with_retry (without the overall deadline)"""
+        attempt_timeout = _attempt_timeout(timeout)
+        for attempt in range(HTTP_RETRIES + 1):
+            retry_after = ''
+            try:
+                async with self.session.get(url, timeout=attempt_timeout) as response:
+                    if response.status not in RETRYABLE_STATUSES or attempt == HTTP_RETRIES:
+                        return response.status, await _read_capped(response)
+                    retry_after = response.headers.get('Retry-After', '')
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == HTTP_RETRIES:
+                    raise
+
+            delay = random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt)
+            if retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), RETRY_MAX_DELAY))
+            await asyncio.sleep(delay)
 
     async def get_multiple_prices(self, token_symbols: list) -> Dict[str, Optional[float]]:
         """
         Get prices for multiple tokens simultaneously
 
+        With stream_prices, the list also replaces the fetcher's streamed symbols
+        (tokens no longer requested are unsubscribed).
+
         Args:
             token_symbols: List of token symbols
 
         Returns:
             Dictionary {token: price_in_usd}
         """
-        tasks = [self.get_token_price(symbol) for symbol in token_symbols]
-        prices = await asyncio.gather(*tasks)
-        return dict(zip(token_symbols, prices))
+        if not self.session:
+            raise RuntimeError("Session not initialized. Use 'async with PriceFetcher()' context manager.")
+
+        if self._ws_stream:
+            self._sync_stream({symbol.upper() for symbol in token_symbols})
+
+        prices: Dict[str, Optional[float]] = {}
+        missing = []
+        for symbol in token_symbols:
+            price = self._live_price(symbol.upper())
+            if price is not None:
+                prices[symbol] = price
+            else:
+                missing.append(symbol)
+
+        if missing:
+            # One CoinGecko call for all tokens, exchanges only for the rest
+            batch_prices, batch_ok = await self._coingecko_batch(missing)
+            now = time.monotonic()
+            for symbol, price in batch_prices.items():
+                self._price_cache[symbol.upper()] = (price, now)
+            prices.update(batch_prices)
+
+            rest = [symbol for symbol in missing if symbol not in batch_prices]
+            tasks = [self.get_token_price(symbol, use_coingecko=not batch_ok) for symbol in rest]
+            prices.update(zip(rest, await asyncio.gather(*tasks)))
+
+        return {symbol: prices.get(symbol) for symbol in token_symbols}
+
+    def _sync_stream(self, symbols: Set[str]) -> None:
+        """Stream exactly these symbols: subscribe new ones, unsubscribe ones no longer requested"""
+        self._ws_stream.subscribe(symbols - self._streamed)
+        self._ws_stream.unsubscribe(self._streamed - symbols)
+        self._streamed = symbols
+
+    async def _coingecko_batch(self, token_symbols: list) -> Tuple[Dict[str, float], bool]:
+        """
+        Get prices for multiple tokens from CoinGecko with one request per 100 tokens
+
+        Args:
+            token_symbols: List of token symbols
+
+        Returns:
+            ({token: price_in_usd} for tokens CoinGecko knows, True if all requests succeeded)
+        """
+        # CoinGecko ID -> symbols (several tickers may map to the same ID)
+        ids: Dict[str, list] = {}
+        for symbol in token_symbols:
+            coingecko_id = self.coingecko_ids.get(symbol.upper(), symbol.lower())
+            ids.setdefault(coingecko_id, []).append(symbol)
+
+        prices: Dict[str, float] = {}
+        all_ok = True
+        id_list = list(ids)
+        for i in range(0, len(id_list), COINGECKO_BATCH_SIZE):
+            chunk = id_list[i:i + COINGECKO_BATCH_SIZE]
+            url = f'https://api.coingecko.com/api/v3/simple/price?ids={",".join(chunk)}&vs_currencies=usd'
+
+            try:
+                data = await self._coingecko_get(url)
+                if data is None:
+                    all_ok = False
+                    continue
+            except Exception as e:
+                logger.warning("⚠️ CoinGecko unavailable: %s", e)
+                all_ok = False
+                continue
+
+            for coingecko_id in chunk:
+                if coingecko_id in data and 'usd' in data[coingecko_id]:
+                    price = data[coingecko_id]['usd']
+                    for symbol in ids[coingecko_id]:
+                        prices[symbol] = price
+                        self._info("✅ %s: $%s (CoinGecko)", symbol, price)
+
+        return prices, all_ok
+
+    async def _coingecko_get(self, url: str) -> Optional[Any]:
+        """
+        Rate-limited CoinGecko GET (waits for token bucket, retries once after HTTP 429)
+
+        Returns:
+            Parsed JSON or None on HTTP error
+        """
+        for attempt in range(2):
+            await self._cg_bucket.acquire()
+            async with self.session.get(url) as response:
+                if response.status == 200:
+                    body = await _read_capped(response)
+                    if body is None:
+                        logger.warning("⚠️ CoinGecko: response larger than %d bytes", MAX_BODY_BYTES)
+                        return None
+                    return orjson.loads(body)
+                if response.status != 429 or attempt:
+                    logger.warning("⚠️ CoinGecko: HTTP %s", response.status)
+                    return None
+                retry_after = response.headers.get('Retry-After', '')
+
+            # Rate limited - wait as asked (capped) and re-queue
+            delay = min(float(retry_after), COINGECKO_MAX_RETRY_AFTER) if retry_after.isdigit() else 1.0
+            logger.warning("⚠️ CoinGecko: rate limited, retrying in %.0f sec", delay)
+            await asyncio.sleep(delay)
+        return None
 
     def convert_price(self, price_usd: float, currency: str) -> float:
         """
@@ -245,15 +1007,7 @@ class PriceFetcher:
         Returns:
             Formatted string with currency symbol
         """
-        currency_symbols = {
-            'USD': '$',
-            'EUR': '€',
-            'RUB': '₽',
-            'UAH': '₴',
-            'KZT': '₸'
-        }
-
-        symbol = currency_symbols.get(currency, '$')
+        symbol = CURRENCY_SYMBOLS.get(currency, '$')
 
         if price >= 1000:
             return f"{symbol}{price:,.2f}"
@@ -264,10 +1018,36 @@ class PriceFetcher:
         else:
             return f"{symbol}{price:.8f}"
 
+    def format_all(self, prices: Dict[str, Optional[float]],
+                   currencies: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Convert and format many prices into many currencies at once
+
+        Args:
+            prices: Dictionary {token: price_in_usd} (tokens without price are skipped)
+            currencies: Target currencies (default: all known except exchange quote currencies like KRW)
+
+        Returns:
+            Dictionary {token: {currency: formatted_price}}
+        """
+        if currencies is None:
+            quote_only = set(QUOTE_CURRENCIES.values())
+            currencies = [currency for currency in self.exchange_rates if currency not in quote_only]
+
+        # Resolve rates once instead of per token
+        rates = [(currency, self.exchange_rates.get(currency, 1.0)) for currency in currencies]
+        return {
+            token: {currency: self.format_price(price_usd * rate, currency) for currency, rate in rates}
+            for token, price_usd in prices.items()
+            if price_usd
+        }
+
 
 # Example usage
 async def test_price_fetcher():
     """Test price fetcher module"""
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     async with PriceFetcher() as fetcher:
         # Update exchange rates
         await fetcher.update_exchange_rates()
@@ -280,12 +1060,12 @@ async def test_price_fetcher():
         print("📊 PRICE RETRIEVAL RESULTS")
         print("=" * 50)
 
-        for token, price_usd in prices.items():
-            if price_usd:
+        formatted = fetcher.format_all(prices, ['USD', 'EUR', 'RUB'])
+        for token in prices:
+            if token in formatted:
                 print(f"\n🔹 {token}:")
-                print(f"   USD: {fetcher.format_price(price_usd, 'USD')}")
-                print(f"   EUR: {fetcher.format_price(fetcher.convert_price(price_usd, 'EUR'), 'EUR')}")
-                print(f"   RUB: {fetcher.format_price(fetcher.convert_price(price_usd, 'RUB'), 'RUB')}")
+                for currency, text in formatted[token].items():
+                    print(f"   {currency}: {text}")
             else:
                 print(f"\n❌ {token}: Price unavailable")
 
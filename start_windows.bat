@@ -46,7 +46,7 @@ if errorlevel 1 (
 
 REM Install dependencies
 echo Installing dependencies...
-pip install -q customtkinter aiohttp
+pip install -q customtkinter aiohttp orjson
 if errorlevel 1 (
     echo ERROR: Failed to install packages
     pause